@@ -0,0 +1,293 @@
+"""
+Transaction Archiver
+Moves closed months of bills out of the partitioned `transactions` table
+(supabase/transactions_partitioning.sql) into compressed archive files, then
+drops the partition so the hot table only holds recent months.
+
+Each month is streamed with a server-side cursor and written as Parquet
+(needs pyarrow) or NDJSON compressed with zstd (needs zstandard, falls back
+to gzip). The partition is locked against writes for the whole run, and is
+only detached and dropped after the archive has been re-read and its row
+count still matches the table.
+
+Each run first calls ensure_transactions_partitions(), which moves bills that
+landed in transactions_default (e.g. backdated ones) into their month, so
+they are archived too. Re-archiving a month never overwrites an earlier
+archive: file names already in the manifest or on disk are skipped.
+
+Connection string is read from DB_CONNECTION_STRING, like scripts/setup-db.js.
+
+Usage: python scripts/archive_transactions.py [--keep-months 3] [--format ndjson|parquet] [--dry-run]
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import re
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+ARCHIVE_DIR = Path("data") / "archive" / "transactions"
+KEEP_MONTHS = 3        # current month plus this many closed months stay hot
+CHUNK_SIZE = 10000     # rows per fetch / Parquet row group
+MONEY_SCALE = 6        # decimal places kept for numeric columns in Parquet
+
+PARTITION_NAME = re.compile(r'^transactions_(\d{4})_(\d{2})$')
+
+# ============================================================================
+# PARTITIONS
+# ============================================================================
+
+def month_index(year: int, month: int) -> int:
+    return year * 12 + (month - 1)
+
+def list_closed_partitions(conn, keep_months: int, schema: str = 'public',
+                           today: Optional[datetime] = None) -> List[Tuple[str, int, int]]:
+    """Return (name, year, month) of monthly partitions older than the hot window"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            JOIN pg_namespace n ON n.oid = p.relnamespace
+            WHERE n.nspname = %s AND p.relname = 'transactions'
+        """, (schema,))
+        names = [row[0] for row in cur.fetchall()]
+
+    today = today or datetime.now(timezone.utc)
+    cutoff = month_index(today.year, today.month) - keep_months
+
+    closed = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if not match:
+            continue  # transactions_default and anything hand-made
+        year, month = int(match.group(1)), int(match.group(2))
+        if month_index(year, month) < cutoff:
+            closed.append((name, year, month))
+    return sorted(closed, key=lambda p: (p[1], p[2]))
+
+def iter_partition(conn, name: str, schema: str = 'public') -> Iterator[List[Dict]]:
+    """Stream a partition in chunks with a server-side cursor"""
+    with conn.cursor(name=f"archive_{name}") as cur:
+        cur.itersize = CHUNK_SIZE
+        cur.execute(f'SELECT * FROM {schema}."{name}" ORDER BY created_at, id')
+        columns = None
+        while True:
+            rows = cur.fetchmany(CHUNK_SIZE)
+            if not rows:
+                break
+            if columns is None:
+                columns = [d.name for d in cur.description]
+            yield [dict(zip(columns, row)) for row in rows]
+
+# ============================================================================
+# ARCHIVE WRITERS
+# ============================================================================
+
+def to_json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)  # exact; money must not go through float
+    return value
+
+def open_ndjson(path: Path, mode: str):
+    """Open a .ndjson.zst (or .ndjson.gz without zstandard) archive as text"""
+    if path.suffix == '.zst':
+        if mode == 'w':
+            raw = zstandard.ZstdCompressor(level=10).stream_writer(open(path, 'wb'), closefd=True)
+        else:
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return io.TextIOWrapper(raw, encoding='utf-8')
+    return gzip.open(path, mode + 't', encoding='utf-8')
+
+def write_ndjson(chunks: Iterator[List[Dict]], path: Path) -> int:
+    rows = 0
+    with open_ndjson(path, 'w') as f:
+        for chunk in chunks:
+            for row in chunk:
+                f.write(json.dumps({k: to_json_value(v) for k, v in row.items()}, ensure_ascii=False))
+                f.write('\n')
+            rows += len(chunk)
+    return rows
+
+def count_ndjson(path: Path) -> int:
+    with open_ndjson(path, 'r') as f:
+        return sum(1 for line in f if line.strip())
+
+def parquet_schema():
+    """Column types for transactions (a chunk alone can't be trusted: all-NULL columns)
+
+    Money columns are exact decimals; a value with more than MONEY_SCALE
+    decimal places makes pyarrow raise, so the month is kept, not rounded.
+    """
+    timestamp = pyarrow.timestamp('us', tz='UTC')
+    money = pyarrow.decimal128(38, MONEY_SCALE)
+    return pyarrow.schema([
+        ('id', pyarrow.int64()),
+        ('created_at', timestamp),
+        ('bill_number', pyarrow.string()),
+        ('customer_name', pyarrow.string()),
+        ('customer_phone', pyarrow.string()),
+        ('items', pyarrow.string()),  # jsonb kept as JSON text
+        ('subtotal', money),
+        ('discount', money),
+        ('gst_amount', money),
+        ('total_amount', money),
+        ('payment_method', pyarrow.string()),
+        ('payment_status', pyarrow.string()),
+        ('transaction_id', pyarrow.string()),
+        ('sms_sent', pyarrow.bool_()),
+        ('sms_sent_at', timestamp),
+        ('sms_claimed_at', timestamp),
+        ('sms_attempts', pyarrow.int16()),
+    ])
+
+def write_parquet(chunks: Iterator[List[Dict]], path: Path) -> int:
+    rows = 0
+    schema = parquet_schema()
+    with pyarrow.parquet.ParquetWriter(path, schema, compression='zstd') as writer:
+        for chunk in chunks:
+            records = [
+                {
+                    k: json.dumps(v) if k == 'items' else v
+                    for k, v in row.items()
+                }
+                for row in chunk
+            ]
+            writer.write_table(pyarrow.Table.from_pylist(records, schema=schema))
+            rows += len(chunk)
+    return rows
+
+def count_parquet(path: Path) -> int:
+    return pyarrow.parquet.ParquetFile(path).metadata.num_rows if path.exists() else 0
+
+def archive_path(name: str, fmt: str, taken: set, archive_dir: Path = ARCHIVE_DIR) -> Path:
+    """First free file name for a partition: never one in `taken` or already on disk"""
+    ext = 'parquet' if fmt == 'parquet' else f"ndjson.{'zst' if zstandard else 'gz'}"
+    path = archive_dir / f"{name}.{ext}"
+    n = 1
+    while path.name in taken or path.exists():
+        n += 1
+        path = archive_dir / f"{name}.{n}.{ext}"
+    return path
+
+# ============================================================================
+# ARCHIVAL
+# ============================================================================
+
+def count_rows(conn, name: str, schema: str = 'public') -> int:
+    with conn.cursor() as cur:
+        cur.execute(f'SELECT count(*) FROM {schema}."{name}"')
+        return cur.fetchone()[0]
+
+def archive_partition(conn, name: str, path: Path, fmt: str, dry_run: bool, schema: str = 'public') -> Dict:
+    """Export one partition to `path`, verify it, then detach and drop it
+
+    Runs in a single transaction holding a SHARE lock on the partition, so no
+    bill can be inserted, updated or deleted between the count, the export
+    and the DROP.
+    """
+    write, count = (write_parquet, count_parquet) if fmt == 'parquet' else (write_ndjson, count_ndjson)
+
+    with conn.transaction():
+        with conn.cursor() as cur:
+            cur.execute(f'LOCK TABLE {schema}."{name}" IN SHARE MODE')
+        expected = count_rows(conn, name, schema)
+        written = write(iter_partition(conn, name, schema), path)
+        archived = count(path)
+        remaining = count_rows(conn, name, schema)
+        if not (expected == written == archived == remaining):
+            raise RuntimeError(
+                f"{name}: {expected} rows in table ({remaining} now), {written} written, {archived} in archive"
+            )
+
+        if not dry_run:
+            with conn.cursor() as cur:
+                cur.execute(f'ALTER TABLE {schema}.transactions DETACH PARTITION {schema}."{name}"')
+                cur.execute(f'DROP TABLE {schema}."{name}"')
+
+    return {
+        'partition': name,
+        'file': path.name,
+        'rows': archived,
+        'bytes': path.stat().st_size,
+        'archived_at': datetime.now(timezone.utc).isoformat(),
+        'dropped': not dry_run,
+    }
+
+def load_manifest() -> Dict:
+    manifest_path = ARCHIVE_DIR / 'manifest.json'
+    if manifest_path.exists():
+        return json.loads(manifest_path.read_text(encoding='utf-8'))
+    return {'archives': []}
+
+def update_manifest(entries: List[Dict]) -> None:
+    manifest = load_manifest()
+    done = {e['file'] for e in entries}
+    manifest['archives'] = [e for e in manifest['archives'] if e['file'] not in done] + entries
+    manifest['archives'].sort(key=lambda e: (e['partition'], e['file']))
+    (ARCHIVE_DIR / 'manifest.json').write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive closed monthly transaction partitions")
+    parser.add_argument('--keep-months', type=int, default=KEEP_MONTHS, help="closed months to keep hot")
+    parser.add_argument('--format', choices=['ndjson', 'parquet'], default='ndjson')
+    parser.add_argument('--dry-run', action='store_true', help="write archives but leave the database unchanged")
+    args = parser.parse_args()
+
+    dsn = os.environ.get('DB_CONNECTION_STRING')
+    if not dsn:
+        print("❌ DB_CONNECTION_STRING is missing")
+        raise SystemExit(1)
+    if args.format == 'parquet' and pyarrow is None:
+        print("❌ Parquet output needs pyarrow (pip install pyarrow)")
+        raise SystemExit(1)
+
+    import psycopg
+
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    # Archives whose partition is gone must never be overwritten
+    taken = {e['file'] for e in load_manifest()['archives'] if e['dropped']}
+
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        if not args.dry_run:
+            conn.execute("SELECT public.ensure_transactions_partitions()")
+        partitions = list_closed_partitions(conn, args.keep_months)
+        print(f"🗄️  {len(partitions)} closed partition(s) to archive")
+
+        for name, _, _ in partitions:
+            path = archive_path(name, args.format, taken)
+            entry = archive_partition(conn, name, path, args.format, args.dry_run)
+            # Record each archive as soon as its partition is gone, so a
+            # failure on a later month can't leave it out of the manifest
+            update_manifest([entry])
+            taken.add(entry['file'])
+            status = "archived" if args.dry_run else "archived and dropped"
+            print(f"   ✅ {name}: {entry['rows']:,} rows -> {entry['file']} ({entry['bytes']:,} bytes), {status}")
+
+    print(f"\n🎉 Done. Archives in '{ARCHIVE_DIR}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Generator Benchmark
+Compares per-row formatting against the precomputed lookup tables in
+generate_data.py. Rows are generated in chunks and discarded, so 10M rows
+run in bounded memory.
+
+Usage: python scripts/benchmark_generate_data.py [rows] [chunk_size]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_data import (
+    MEDICINES,
+    MANUFACTURERS,
+    generate_barcode,
+    generate_product_id,
+    generate_medicines,
+    get_lookup_tables,
+)
+
+DEFAULT_ROWS = 10_000_000
+DEFAULT_CHUNK = 100_000
+
+# ============================================================================
+# BASELINE (per-row datetime + string formatting, as before the tables)
+# ============================================================================
+
+def legacy_expiry_date() -> str:
+    days = random.randint(180, 1095)
+    return (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
+
+def legacy_medicines(start_id: int, count: int) -> list:
+    products = []
+    subcategories = list(MEDICINES.keys())
+
+    for i in range(count):
+        subcat = random.choice(subcategories)
+        name_base, dosages, min_price, max_price = random.choice(MEDICINES[subcat])
+
+        dosage = random.choice(dosages)
+        pack_size = random.choice(['10 tablets', '15 tablets', '20 tablets', '30 tablets', '100ml syrup', '150ml syrup'])
+
+        mrp = round(random.uniform(min_price, max_price), 2)
+        if 'syrup' in pack_size.lower():
+            mrp = round(mrp * 1.5, 2)
+
+        cost_price = round(mrp * random.uniform(0.65, 0.80), 2)
+
+        products.append({
+            'id': generate_product_id(start_id + i),
+            'barcode': generate_barcode(),
+            'name': f"{name_base} {dosage}",
+            'generic_name': name_base,
+            'category': 'MEDICINE',
+            'subcategory': subcat,
+            'manufacturer': random.choice(MANUFACTURERS['MEDICINE']),
+            'pack_size': pack_size,
+            'dosage': dosage,
+            'mrp': mrp,
+            'cost_price': cost_price,
+            'stock_quantity': random.randint(0, 500),
+            'prescription_required': subcat in ['ANTIBIOTIC', 'DIABETES', 'BP_HEART'],
+            'gst_percentage': 12.0,
+            'hsn_code': f"3004{random.randint(1000, 9999)}",
+            'expiry_date': legacy_expiry_date(),
+            'description': f"Used for treating {subcat.lower().replace('_', ' ')}"
+        })
+
+    return products
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def run(generator, rows: int, chunk_size: int) -> float:
+    """Generate `rows` products chunk by chunk, return elapsed seconds"""
+    random.seed(42)
+    start = time.perf_counter()
+    done = 0
+    while done < rows:
+        n = min(chunk_size, rows - done)
+        generator(done + 1, n)
+        done += n
+    return time.perf_counter() - start
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNK
+
+    print("="*70)
+    print("GENERATOR BENCHMARK")
+    print("="*70)
+    print(f"\nRows: {rows:,}  (chunks of {chunk_size:,})\n")
+
+    start = time.perf_counter()
+    get_lookup_tables()
+    build_time = time.perf_counter() - start
+    print(f"🔧 Lookup tables built in {build_time * 1000:.1f} ms")
+
+    legacy = run(legacy_medicines, rows, chunk_size)
+    print(f"⏱️  Per-row formatting: {legacy:8.2f} s  ({rows / legacy:,.0f} rows/s)")
+
+    tabled = run(generate_medicines, rows, chunk_size)
+    print(f"⏱️  Lookup tables:      {tabled:8.2f} s  ({rows / tabled:,.0f} rows/s)")
+
+    print(f"\n🚀 Speedup: {legacy / tabled:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+SMS Dispatch Benchmark
+Pushes synthetic receipts through the dispatch worker with the local mock
+provider and reports throughput against the 100k receipts/hour target.
+Three runs:
+  - inline:    one at a time (batch 1, 1 in flight), like the old checkout flow
+  - unlimited: the queue with the rate limiter off, i.e. its raw capacity
+  - limited:   the queue with the worker's default RATE_LIMIT, which is what a
+               deployed worker actually sustains; this run is checked against
+               the target
+
+Usage: python scripts/benchmark_sms_dispatch.py [receipts] [latency_seconds]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sms_dispatch import RATE_LIMIT, Dispatcher, MemoryStore, MockProvider
+
+DEFAULT_RECEIPTS = 100_000
+DEFAULT_LATENCY = 0.2          # seconds per provider request
+TARGET_PER_HOUR = 100_000
+BASELINE_RECEIPTS = 50
+LIMITED_SECONDS = 30           # length of the rate-limited run
+
+def make_transactions(count: int) -> list:
+    random.seed(42)
+    return [
+        {
+            'id': i,
+            'bill_number': f"PHM{1700000000000 + i}",
+            'customer_name': 'Guest',
+            'customer_phone': f"98{random.randint(10000000, 99999999)}",
+            'items': [
+                {'name': f"Product {random.randint(1, 1000)}", 'quantity': random.randint(1, 3),
+                 'mrp': round(random.uniform(15, 500), 2)}
+                for _ in range(random.randint(1, 8))
+            ],
+            'total_amount': round(random.uniform(50, 3000), 2),
+            'payment_method': 'CASH',
+            'created_at': '2025-12-12T10:00:00',
+        }
+        for i in range(count)
+    ]
+
+def run(receipts: int, latency: float, rate=None, **options) -> tuple:
+    store = MemoryStore(make_transactions(receipts))
+    dispatcher = Dispatcher(store, MockProvider(latency=latency), rate=rate, **options)
+    start = time.perf_counter()
+    stats = asyncio.run(dispatcher.run(once=True))
+    elapsed = time.perf_counter() - start
+    return stats, elapsed, store.update_statements
+
+def main():
+    receipts = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECEIPTS
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LATENCY
+
+    print("="*70)
+    print("SMS DISPATCH BENCHMARK")
+    print("="*70)
+    print(f"\nMock provider latency: {latency * 1000:.0f} ms per request\n")
+
+    stats, elapsed, _ = run(BASELINE_RECEIPTS, latency, batch_size=1, max_in_flight=1)
+    baseline_rate = stats['sent'] / elapsed * 3600
+    print(f"⏱️  Inline (1 at a time): {stats['sent']:,} in {elapsed:.2f} s -> {baseline_rate:,.0f} receipts/hour")
+
+    stats, elapsed, updates = run(receipts, latency)
+    rate = stats['sent'] / elapsed * 3600
+    print(f"⏱️  Queue, no limit:      {stats['sent']:,} in {elapsed:.2f} s -> {rate:,.0f} receipts/hour")
+    print(f"   {updates:,} bulk sms_sent updates")
+
+    # Rate-limited run sized to last about LIMITED_SECONDS at the default limit
+    limited_receipts = int(RATE_LIMIT * LIMITED_SECONDS)
+    stats, elapsed, _ = run(limited_receipts, latency, rate=RATE_LIMIT)
+    limited_rate = stats['sent'] / elapsed * 3600
+    print(f"⏱️  Queue, {RATE_LIMIT:g} msg/s limit: {stats['sent']:,} in {elapsed:.2f} s -> {limited_rate:,.0f} receipts/hour")
+
+    status = "✅" if limited_rate >= TARGET_PER_HOUR else "❌"
+    print(f"\n{status} Target {TARGET_PER_HOUR:,}/hour with the default rate limit, "
+          f"speedup {limited_rate / baseline_rate:.0f}x over inline")
+
+if __name__ == "__main__":
+    main()
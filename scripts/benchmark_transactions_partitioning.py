@@ -0,0 +1,174 @@
+"""
+Transaction Partitioning Benchmark
+Grows years of generated bill history on a local Postgres and checks that
+recent-bill lookups and inserts stay flat. Compares:
+  - heap:        one unpartitioned table (transactions.sql today)
+  - partitioned: monthly partitions with closed months archived and
+                 dropped (transactions_partitioning.sql + archive_transactions.py)
+
+The partitioned table and its partition functions are created from
+transactions_partitioning.sql itself, and closed months go through
+archive_transactions.archive_partition, so the code being measured is the
+code that ships. Everything runs in a scratch schema (and a temporary
+archive directory) that is dropped afterwards.
+Connection string is read from DB_CONNECTION_STRING.
+
+Usage: python scripts/benchmark_transactions_partitioning.py [years] [bills_per_day]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from archive_transactions import archive_partition, archive_path, list_closed_partitions
+
+SCHEMA = 'bench_transactions'
+DEFAULT_YEARS = 5
+DEFAULT_BILLS_PER_DAY = 1000
+KEEP_MONTHS = 3
+LOOKUPS = 200
+INSERTS = 500
+
+MIGRATION = Path(__file__).resolve().parent.parent / 'supabase' / 'transactions_partitioning.sql'
+
+ITEMS = json.dumps([{'name': 'Dolo 650 Tablet', 'quantity': 2, 'mrp': 30.5}])
+
+# ============================================================================
+# SETUP
+# ============================================================================
+
+def migration_sql() -> str:
+    """Table, indexes and partition functions from transactions_partitioning.sql, in SCHEMA"""
+    sql = MIGRATION.read_text(encoding='utf-8')
+    start = sql.index('-- 2. Partitioned table')
+    end = sql.index('-- 4. Backfill')
+    return sql[start:end].replace('public.', f'{SCHEMA}.')
+
+def setup(cur):
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SCHEMA}")
+    cur.execute(migration_sql())
+    cur.execute(f"CREATE TABLE {SCHEMA}.heap (LIKE {SCHEMA}.transactions INCLUDING DEFAULTS INCLUDING IDENTITY, primary key (id))")
+    cur.execute(f"CREATE INDEX ON {SCHEMA}.heap (created_at desc)")
+    cur.execute(f"CREATE INDEX ON {SCHEMA}.heap (bill_number)")
+
+def month_start(day: datetime) -> datetime:
+    return day.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def next_month(day: datetime) -> datetime:
+    return (month_start(day) + timedelta(days=32)).replace(day=1)
+
+def load_history(cur, start: datetime, end: datetime, bills_per_day: int):
+    """Insert generated bills between start and end into both layouts"""
+    month = month_start(start)
+    while month < end:
+        cur.execute(f"SELECT {SCHEMA}.create_transactions_partition(%s::date)", (month.date(),))
+        month = next_month(month)
+
+    seconds = int((end - start).total_seconds())
+    count = int((end - start).days * bills_per_day)
+    for table in ('heap', 'transactions'):
+        cur.execute(f"""
+            INSERT INTO {SCHEMA}.{table}
+              (created_at, bill_number, customer_name, customer_phone, items,
+               subtotal, discount, gst_amount, total_amount, payment_method)
+            SELECT %(start)s::timestamptz + (g::bigint * %(seconds)s / %(count)s) * interval '1 second',
+                   'PHM' || to_char(%(start)s::timestamptz + (g::bigint * %(seconds)s / %(count)s) * interval '1 second', 'YYYYMMDD') || lpad(g::text, 8, '0'),
+                   'Guest', '98' || lpad((g %% 100000000)::text, 8, '0'), %(items)s::jsonb,
+                   100, 0, 12, 112, 'CASH'
+            FROM generate_series(0, %(count)s - 1) AS g
+        """, {'start': start, 'seconds': seconds, 'count': count, 'items': ITEMS})
+    cur.execute(f"SELECT {SCHEMA}.ensure_transactions_partitions()")
+    cur.execute(f"ANALYZE {SCHEMA}.heap")
+    cur.execute(f"ANALYZE {SCHEMA}.transactions")
+
+def archive_closed_months(conn, now: datetime, archive_dir: Path) -> int:
+    """Archive and drop partitions older than the hot window with the real archiver"""
+    rows = 0
+    for name, _, _ in list_closed_partitions(conn, KEEP_MONTHS, schema=SCHEMA, today=now):
+        path = archive_path(name, 'ndjson', set(), archive_dir)
+        rows += archive_partition(conn, name, path, 'ndjson', dry_run=False, schema=SCHEMA)['rows']
+    return rows
+
+# ============================================================================
+# MEASUREMENTS
+# ============================================================================
+
+def measure(cur, table: str, now: datetime) -> dict:
+    """Average ms for recent-bill lookups and single-row inserts"""
+    cur.execute(f"SELECT bill_number FROM {SCHEMA}.{table} ORDER BY created_at DESC LIMIT %s", (LOOKUPS,))
+    recent = [row[0] for row in cur.fetchall()]
+
+    start = time.perf_counter()
+    for bill in recent:
+        cur.execute(f"SELECT * FROM {SCHEMA}.{table} WHERE bill_number = %s", (bill,))
+        cur.fetchall()
+    lookup = (time.perf_counter() - start) / len(recent) * 1000
+
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        cur.execute(f"SELECT * FROM {SCHEMA}.{table} ORDER BY created_at DESC LIMIT 50")
+        cur.fetchall()
+    latest = (time.perf_counter() - start) / LOOKUPS * 1000
+
+    start = time.perf_counter()
+    for i in range(INSERTS):
+        cur.execute(
+            f"INSERT INTO {SCHEMA}.{table} (created_at, bill_number, items, total_amount) VALUES (%s, %s, %s::jsonb, 112)",
+            (now, f"BENCH{now:%Y%m%d}{i:06d}", ITEMS)
+        )
+    insert = (time.perf_counter() - start) / INSERTS * 1000
+
+    cur.execute(f"SELECT count(*) FROM {SCHEMA}.{table}")
+    rows = cur.fetchone()[0]
+    return {'rows': rows, 'lookup': lookup, 'latest': latest, 'insert': insert}
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_YEARS
+    bills_per_day = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BILLS_PER_DAY
+
+    dsn = os.environ.get('DB_CONNECTION_STRING')
+    if not dsn:
+        print("❌ DB_CONNECTION_STRING is missing (point it at a local Postgres)")
+        raise SystemExit(1)
+
+    import psycopg
+
+    print("="*70)
+    print("TRANSACTION PARTITIONING BENCHMARK")
+    print("="*70)
+    print(f"\n{years} years x {bills_per_day:,} bills/day, {KEEP_MONTHS} closed months kept hot\n")
+    print(f"{'year':>4} {'layout':>12} {'rows':>11} {'by bill ms':>11} {'latest 50 ms':>13} {'insert ms':>10}")
+
+    today = month_start(datetime.now(timezone.utc))
+    first_day = today.replace(year=today.year - years)
+
+    with psycopg.connect(dsn, autocommit=True) as conn, conn.cursor() as cur, \
+         tempfile.TemporaryDirectory() as archive_dir:
+        setup(cur)
+        try:
+            for year in range(1, years + 1):
+                start = first_day.replace(year=first_day.year + year - 1)
+                end = first_day.replace(year=first_day.year + year)
+                load_history(cur, start, end, bills_per_day)
+
+                started = time.perf_counter()
+                archived = archive_closed_months(conn, end, Path(archive_dir))
+                elapsed = time.perf_counter() - started
+
+                for layout, table in (('heap', 'heap'), ('partitioned', 'transactions')):
+                    result = measure(cur, table, end - timedelta(minutes=1))
+                    print(f"{year:>4} {layout:>12} {result['rows']:>11,} {result['lookup']:>11.3f} "
+                          f"{result['latest']:>13.3f} {result['insert']:>10.3f}")
+                print(f"     🗄️  archived and dropped {archived:,} rows in {elapsed:.1f}s")
+        finally:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+
+    print("\n✅ Done. Partitioned rows stay bounded by the hot window; compare timings year over year")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Catalog Deduplication
+Groups duplicate products into canonical products and rewrites the search
+index to point at canonical IDs only.
+
+Two passes over the input, streamed row by row:
+  1. Exact grouping: each row is hashed on its normalized
+     (name, dosage, manufacturer, pack_size) key. Distinct names are then
+     blocked with MinHash/LSH and misspellings are merged; names with an
+     extra or different word (Pan vs Pan-D, Metformin vs Metformin SR) never
+     merge.
+  2. Mapping: every row is written to a product_id -> canonical_id CSV;
+     canonical rows go to a deduplicated catalog and search index.
+
+Memory grows with the number of distinct keys and names, not with rows,
+so 10M generated rows (a few thousand distinct keys) fit comfortably.
+
+Input is NDJSON (one product per line), CSV (e.g. an `inventory` export
+with `id`, `med_name`, `pack_size`) or the generator's products.json.
+
+Usage: python scripts/dedup_catalog.py data/products.json [--out data/dedup]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import random
+import re
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# MinHash / LSH parameters: 16 bands x 4 rows flags pairs from ~0.5 Jaccard,
+# candidates are then verified against SIMILARITY_THRESHOLD.
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.7
+# Names only merge as typos: same token count, and each differing token pair
+# is a small edit on a word long enough not to be a variant marker (SR, D, H...)
+MIN_TYPO_TOKEN = 5
+MAX_TYPO_EDITS = 1
+MAX_TYPO_EDITS_LONG = 2   # tokens of LONG_TOKEN characters or more
+LONG_TOKEN = 10
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Spelling variants seen in `inventory.med_name`
+UNIT_ALIASES = {
+    'tab': 'tablet', 'tabs': 'tablet', 'tablets': 'tablet',
+    'cap': 'capsule', 'caps': 'capsule', 'capsules': 'capsule',
+    'inj': 'injection', 'syp': 'syrup', 'susp': 'suspension',
+    'oint': 'ointment', 'pcs': 'pieces', 'pc': 'pieces',
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9.]+')
+_NUMBER_UNIT = re.compile(r'(\d+(?:\.\d+)?)\s+(mg|mcg|g|kg|ml|l|iu)\b')
+_DIGITS = re.compile(r'\d+(?:\.\d+)?')
+
+# ============================================================================
+# NORMALIZATION
+# ============================================================================
+
+def normalize(value: Optional[str]) -> str:
+    """Lowercase, strip punctuation, expand unit abbreviations"""
+    if not value:
+        return ''
+    text = _NON_ALNUM.sub(' ', str(value).lower())
+    text = _NUMBER_UNIT.sub(r'\1\2', text)
+    return ' '.join(UNIT_ALIASES.get(token, token) for token in text.split())
+
+def product_fields(row: Dict, index: int) -> Tuple[str, str, str, str, str]:
+    """Return (id, name, dosage, manufacturer, pack_size) for a product or inventory row
+
+    Rows without an `id` (e.g. generate_pharmacy_data.py output) fall back to
+    their barcode, then to their row number.
+    """
+    product_id = row.get('id') or row.get('barcode')
+    return (
+        str(product_id) if product_id not in (None, '') else f"row_{index}",
+        normalize(row.get('name') or row.get('med_name')),
+        normalize(row.get('dosage')),
+        normalize(row.get('manufacturer')),
+        normalize(row.get('pack_size')),
+    )
+
+def key_digest(*parts: str) -> bytes:
+    """8-byte hash of a normalized key"""
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=8).digest()
+
+# ============================================================================
+# INPUT
+# ============================================================================
+
+def iter_rows(path: Path) -> Iterator[Dict]:
+    """Stream product rows from NDJSON, CSV or the generator's products.json"""
+    suffix = path.suffix.lower()
+    with open(path, encoding='utf-8', newline='') as f:
+        if suffix == '.csv':
+            yield from csv.DictReader(f)
+        elif suffix in ('.ndjson', '.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            # products.json is a single document; only suitable for small catalogs
+            data = json.load(f)
+            yield from data['products'] if isinstance(data, dict) else data
+
+# ============================================================================
+# MINHASH / LSH
+# ============================================================================
+
+class MinHasher:
+    """MinHash signatures over character shingles"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+    @staticmethod
+    def shingles(text: str) -> set:
+        padded = f" {text} "
+        if len(padded) <= SHINGLE_SIZE:
+            return {padded}
+        return {padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+
+    def signature(self, shingles: set) -> List[int]:
+        hashes = [
+            struct.unpack('<I', hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest())[0]
+            for s in shingles
+        ]
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.perms
+        ]
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance"""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+def is_typo_variant(a: str, b: str) -> bool:
+    """True if two names differ only by misspelt words, never by an added or different word
+
+    "paracetmol 500mg" ~ "paracetamol 500mg", but not "pan 40mg" ~ "pan d 40mg",
+    "metformin sr 500mg" ~ "metformin 500mg" or "cetirizine" ~ "levocetirizine".
+    """
+    tokens_a, tokens_b = a.split(), b.split()
+    if len(tokens_a) != len(tokens_b):
+        return False
+    for ta, tb in zip(tokens_a, tokens_b):
+        if ta == tb:
+            continue
+        if min(len(ta), len(tb)) < MIN_TYPO_TOKEN or _DIGITS.search(ta) or _DIGITS.search(tb):
+            return False
+        limit = MAX_TYPO_EDITS_LONG if min(len(ta), len(tb)) >= LONG_TOKEN else MAX_TYPO_EDITS
+        if edit_distance(ta, tb) > limit:
+            return False
+    return True
+
+def cluster_names(name_counts: Dict[str, int]) -> Dict[str, str]:
+    """Map each distinct normalized name to its cluster's canonical spelling"""
+    names = list(name_counts)
+    parent = list(range(len(names)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    hasher = MinHasher()
+    shingle_sets = [hasher.shingles(name) for name in names]
+    numbers = [tuple(_DIGITS.findall(name)) for name in names]
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+    for i, shingles in enumerate(shingle_sets):
+        sig = hasher.signature(shingles)
+        for band in range(LSH_BANDS):
+            band_key = (band, tuple(sig[band * LSH_ROWS:(band + 1) * LSH_ROWS]))
+            buckets.setdefault(band_key, []).append(i)
+
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        # Different strengths ("500mg" vs "650mg") are never the same product
+        by_strength: Dict[Tuple[str, ...], List[int]] = {}
+        for i in members:
+            by_strength.setdefault(numbers[i], []).append(i)
+        for block in by_strength.values():
+            for pos, first in enumerate(block):
+                for other in block[pos + 1:]:
+                    if (find(first) != find(other)
+                            and jaccard(shingle_sets[first], shingle_sets[other]) >= SIMILARITY_THRESHOLD
+                            and is_typo_variant(names[first], names[other])):
+                        parent[find(other)] = find(first)
+
+    # Most frequent spelling wins, ties broken alphabetically
+    best: Dict[int, str] = {}
+    for i, name in enumerate(names):
+        root = find(i)
+        current = best.get(root)
+        if current is None or (-name_counts[name], name) < (-name_counts[current], current):
+            best[root] = name
+
+    return {name: best[find(i)] for i, name in enumerate(names)}
+
+# ============================================================================
+# DEDUPLICATION
+# ============================================================================
+
+def build_groups(path: Path) -> Tuple[Dict[bytes, Tuple[int, str]], int]:
+    """Pass 1: return exact-key digest -> (canonical row index, canonical ID), and row count"""
+    # digest -> (first row index, first id, name, dosage, manufacturer, pack_size)
+    groups: Dict[bytes, Tuple] = {}
+    name_counts: Dict[str, int] = {}
+    rows = 0
+
+    for index, row in enumerate(iter_rows(path)):
+        product_id, name, dosage, manufacturer, pack_size = product_fields(row, index)
+        digest = key_digest(name, dosage, manufacturer, pack_size)
+        if digest not in groups:
+            groups[digest] = (index, product_id, name, dosage, manufacturer, pack_size)
+        name_counts[name] = name_counts.get(name, 0) + 1
+        rows += 1
+
+    canonical_names = cluster_names(name_counts)
+
+    # Re-key exact groups on the canonical name; earliest row becomes canonical
+    resolved: Dict[bytes, Tuple[int, str]] = {}
+    for digest, (index, product_id, name, dosage, manufacturer, pack_size) in groups.items():
+        merged = key_digest(canonical_names[name], dosage, manufacturer, pack_size)
+        current = resolved.get(merged)
+        if current is None or index < current[0]:
+            resolved[merged] = (index, product_id)
+
+    canonical_ids = {}
+    for digest, (_, _, name, dosage, manufacturer, pack_size) in groups.items():
+        merged = key_digest(canonical_names[name], dosage, manufacturer, pack_size)
+        canonical_ids[digest] = resolved[merged]
+
+    return canonical_ids, rows
+
+def write_outputs(path: Path, canonical_ids: Dict[bytes, Tuple[int, str]], out_dir: Path) -> Dict:
+    """Pass 2: write ID mapping, canonical catalog and canonical search index"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index = {
+        'by_name': {},
+        'by_barcode': {},
+        'by_category': {}
+    }
+    canonical_count = 0
+
+    with open(out_dir / 'canonical_map.csv', 'w', encoding='utf-8', newline='') as map_file, \
+         open(out_dir / 'canonical_products.ndjson', 'w', encoding='utf-8') as catalog_file:
+        writer = csv.writer(map_file)
+        writer.writerow(['product_id', 'canonical_id'])
+
+        for row_index, row in enumerate(iter_rows(path)):
+            product_id, name, dosage, manufacturer, pack_size = product_fields(row, row_index)
+            canonical_index, canonical_id = canonical_ids[key_digest(name, dosage, manufacturer, pack_size)]
+            writer.writerow([product_id, canonical_id])
+
+            # Compare row positions, not IDs, so repeated input IDs still yield one canonical row
+            if row_index != canonical_index:
+                continue
+
+            canonical_count += 1
+            catalog_file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+            name_key = (row.get('name') or row.get('med_name') or '').lower()
+            index['by_name'].setdefault(name_key, []).append(product_id)
+            if row.get('barcode'):
+                index['by_barcode'][row['barcode']] = product_id
+            index['by_category'].setdefault(row.get('category') or 'MEDICINE', []).append(product_id)
+
+    with open(out_dir / 'search_index.json', 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=0)
+
+    return {'canonical_products': canonical_count}
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate a product catalog into canonical products")
+    parser.add_argument('input', type=Path, help="products.json, .ndjson/.jsonl or inventory .csv")
+    parser.add_argument('--out', type=Path, default=Path('data') / 'dedup', help="output directory")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("CATALOG DEDUPLICATION")
+    print("="*70)
+
+    print(f"\n🔍 Grouping products in {args.input}...")
+    canonical_ids, rows = build_groups(args.input)
+
+    print("💾 Writing canonical mapping and index...")
+    stats = write_outputs(args.input, canonical_ids, args.out)
+
+    print(f"\n✅ {rows:,} rows -> {stats['canonical_products']:,} canonical products")
+    print(f"   📄 {args.out / 'canonical_map.csv'}")
+    print(f"   📄 {args.out / 'canonical_products.ndjson'}")
+    print(f"   📄 {args.out / 'search_index.json'}")
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import List, Dict
 import string
 import sys
+from functools import lru_cache
 
 # Ensure data directory exists
 OUTPUT_DIR = Path("data")
@@ -160,6 +161,61 @@ MANUFACTURERS = {
     'BABY': ['Nestle', 'J&J', 'Philips Avent', 'Chicco']
 }
 
+MEDICINE_PACK_SIZES = ['10 tablets', '15 tablets', '20 tablets', '30 tablets', '100ml syrup', '150ml syrup']
+RX_SUBCATEGORIES = {'ANTIBIOTIC', 'DIABETES', 'BP_HEART'}
+
+# Expiry window in days from today (6 months to 3 years, inclusive)
+EXPIRY_MIN_DAYS = 180
+EXPIRY_MAX_DAYS = 1095
+
+# HSN chapter prefixes; each code is the prefix plus a 4-digit suffix
+HSN_PREFIXES = {
+    'MEDICINE': '3004',
+    'OTC': '9018',
+    'PERSONAL_CARE': '3304',
+    'BABY_PRODUCTS': '1901',
+}
+
+# ============================================================================
+# PRECOMPUTED LOOKUP TABLES
+# ============================================================================
+# Every formatted string a product row can contain is rendered once per run,
+# so the per-row path below is only random picks into these tables.
+
+@lru_cache(maxsize=1)
+def get_lookup_tables() -> Dict:
+    """Build expiry, name/description and HSN tables once per run"""
+    today = datetime.now()
+    expiry_dates = [
+        (today + timedelta(days=days)).strftime('%Y-%m-%d')
+        for days in range(EXPIRY_MIN_DAYS, EXPIRY_MAX_DAYS + 1)
+    ]
+
+    hsn_codes = {
+        category: [f"{prefix}{n}" for n in range(1000, 10000)]
+        for category, prefix in HSN_PREFIXES.items()
+    }
+
+    # (generic_name, [(name, dosage), ...], min_price, max_price) per subcategory
+    medicines = {
+        subcat: [
+            (name_base, [(f"{name_base} {dosage}", dosage) for dosage in dosages], min_price, max_price)
+            for name_base, dosages, min_price, max_price in templates
+        ]
+        for subcat, templates in MEDICINES.items()
+    }
+    medicine_descriptions = {
+        subcat: f"Used for treating {subcat.lower().replace('_', ' ')}"
+        for subcat in MEDICINES
+    }
+
+    return {
+        'expiry_dates': expiry_dates,
+        'hsn_codes': hsn_codes,
+        'medicines': medicines,
+        'medicine_descriptions': medicine_descriptions,
+    }
+
 # ============================================================================
 # GENERATOR FUNCTIONS
 # ============================================================================
@@ -174,25 +230,28 @@ def generate_product_id(index: int) -> str:
 
 def generate_expiry_date() -> str:
     """Generate expiry 6 months to 3 years from now"""
-    days = random.randint(180, 1095)
-    return (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
+    return random.choice(get_lookup_tables()['expiry_dates'])
 
 def generate_medicines(start_id: int, count: int) -> List[Dict]:
     """Generate medicine products"""
     products = []
+    tables = get_lookup_tables()
+    medicines = tables['medicines']
+    descriptions = tables['medicine_descriptions']
+    expiry_dates = tables['expiry_dates']
+    hsn_codes = tables['hsn_codes']['MEDICINE']
     subcategories = list(MEDICINES.keys())
     
     for i in range(count):
         subcat = random.choice(subcategories)
-        medicine_data = random.choice(MEDICINES[subcat])
-        name_base, dosages, min_price, max_price = medicine_data
+        name_base, variants, min_price, max_price = random.choice(medicines[subcat])
         
-        dosage = random.choice(dosages)
-        pack_size = random.choice(['10 tablets', '15 tablets', '20 tablets', '30 tablets', '100ml syrup', '150ml syrup'])
+        name, dosage = random.choice(variants)
+        pack_size = random.choice(MEDICINE_PACK_SIZES)
         
         # Adjust price based on pack size
         mrp = round(random.uniform(min_price, max_price), 2)
-        if 'syrup' in pack_size.lower():
+        if 'syrup' in pack_size:
             mrp = round(mrp * 1.5, 2)
         
         cost_price = round(mrp * random.uniform(0.65, 0.80), 2)
@@ -200,7 +259,7 @@ def generate_medicines(start_id: int, count: int) -> List[Dict]:
         products.append({
             'id': generate_product_id(start_id + i),
             'barcode': generate_barcode(),
-            'name': f"{name_base} {dosage}",
+            'name': name,
             'generic_name': name_base,
             'category': 'MEDICINE',
             'subcategory': subcat,
@@ -210,11 +269,11 @@ def generate_medicines(start_id: int, count: int) -> List[Dict]:
             'mrp': mrp,
             'cost_price': cost_price,
             'stock_quantity': random.randint(0, 500),
-            'prescription_required': subcat in ['ANTIBIOTIC', 'DIABETES', 'BP_HEART'],
+            'prescription_required': subcat in RX_SUBCATEGORIES,
             'gst_percentage': 12.0,
-            'hsn_code': f"3004{random.randint(1000, 9999)}",
-            'expiry_date': generate_expiry_date(),
-            'description': f"Used for treating {subcat.lower().replace('_', ' ')}"
+            'hsn_code': random.choice(hsn_codes),
+            'expiry_date': random.choice(expiry_dates),
+            'description': descriptions[subcat]
         })
     
     return products
@@ -222,6 +281,7 @@ def generate_medicines(start_id: int, count: int) -> List[Dict]:
 def generate_otc_items(start_id: int, count: int) -> List[Dict]:
     """Generate OTC items"""
     products = []
+    hsn_codes = get_lookup_tables()['hsn_codes']['OTC']
     subcategories = list(OTC_ITEMS.keys())
     
     for i in range(count):
@@ -248,7 +308,7 @@ def generate_otc_items(start_id: int, count: int) -> List[Dict]:
             'stock_quantity': random.randint(10, 300),
             'prescription_required': False,
             'gst_percentage': 18.0,
-            'hsn_code': f"9018{random.randint(1000, 9999)}",
+            'hsn_code': random.choice(hsn_codes),
             'expiry_date': None,
             'description': f"Medical device for healthcare"
         })
@@ -258,6 +318,7 @@ def generate_otc_items(start_id: int, count: int) -> List[Dict]:
 def generate_personal_care(start_id: int, count: int) -> List[Dict]:
     """Generate personal care items"""
     products = []
+    hsn_codes = get_lookup_tables()['hsn_codes']['PERSONAL_CARE']
     subcategories = list(PERSONAL_CARE.keys())
     
     for i in range(count):
@@ -284,7 +345,7 @@ def generate_personal_care(start_id: int, count: int) -> List[Dict]:
             'stock_quantity': random.randint(30, 400),
             'prescription_required': False,
             'gst_percentage': 18.0,
-            'hsn_code': f"3304{random.randint(1000, 9999)}",
+            'hsn_code': random.choice(hsn_codes),
             'expiry_date': None,
             'description': f"Personal care product"
         })
@@ -294,6 +355,9 @@ def generate_personal_care(start_id: int, count: int) -> List[Dict]:
 def generate_baby_products(start_id: int, count: int) -> List[Dict]:
     """Generate baby products"""
     products = []
+    tables = get_lookup_tables()
+    expiry_dates = tables['expiry_dates']
+    hsn_codes = tables['hsn_codes']['BABY_PRODUCTS']
     subcategories = list(BABY_PRODUCTS.keys())
     
     for i in range(count):
@@ -320,8 +384,8 @@ def generate_baby_products(start_id: int, count: int) -> List[Dict]:
             'stock_quantity': random.randint(20, 250),
             'prescription_required': False,
             'gst_percentage': 12.0,
-            'hsn_code': f"1901{random.randint(1000, 9999)}",
-            'expiry_date': generate_expiry_date() if 'Food' in name or 'Lactogen' in name else None,
+            'hsn_code': random.choice(hsn_codes),
+            'expiry_date': random.choice(expiry_dates) if 'Food' in name or 'Lactogen' in name else None,
             'description': f"Baby care product"
         })
     
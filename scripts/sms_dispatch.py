@@ -0,0 +1,377 @@
+"""
+Receipt SMS Dispatch Worker
+Sends bill receipts off the checkout path. Checkout only saves the
+transaction; this worker claims unsent bills from the `transactions` table,
+renders receipt messages from templates and sends them in batches through a
+pluggable provider with bounded concurrency and rate limiting. Delivered
+bills are marked `sms_sent` in one bulk UPDATE per batch.
+
+Only run this worker when the app is built with VITE_SMS_DISPATCH_QUEUE=true.
+Without it the browser sends receipts itself and leaves `sms_sent` false,
+so the worker would text those bills a second time.
+
+Requires supabase/sms_dispatch.sql and psycopg (`pip install psycopg`) for
+the Postgres queue. Connection string is read from DB_CONNECTION_STRING,
+like scripts/setup-db.js.
+
+Usage: python scripts/sms_dispatch.py [--provider mock|msg91] [--once]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+BATCH_SIZE = 50            # receipts per provider request
+MAX_IN_FLIGHT = 8          # concurrent provider requests
+RATE_LIMIT = 50.0          # messages per second (None = unlimited)
+MAX_ATTEMPTS = 3           # give up on a receipt after this many failures
+CLAIM_TIMEOUT_MINUTES = 5  # reclaim from a crashed worker / wait before a retry
+MAX_AGE_HOURS = 24         # older unsent bills are not worth texting
+POLL_INTERVAL = 2.0        # seconds to sleep when the queue is empty
+
+# ============================================================================
+# TEMPLATES (kept in sync with SMSService.formatReceipt)
+# ============================================================================
+
+TEMPLATES = {
+    'short': (
+        "MedPlus Bill {bill_number}\n"
+        "Total: ₹{total}\n"
+        "Paid: {payment_method}\n"
+        "Items: {item_count}\n"
+        "Thank you! - MedPlus"
+    ),
+    'detailed': (
+        "MedPlus Pharmacy\n"
+        "Bill: {bill_number}\n"
+        "Date: {date}\n"
+        "Customer: {customer_name}\n"
+        "\n"
+        "Items:\n"
+        "{items}\n"
+        "\n"
+        "Total: ₹{total}\n"
+        "Payment: {payment_method}\n"
+        "\n"
+        "Thank you for shopping!\n"
+        "Call: 1800-XXX-XXXX"
+    ),
+}
+
+def render_receipt(txn: Dict, template: str = 'short') -> str:
+    """Render a transaction row into an SMS body"""
+    items = txn.get('items') or []
+    if isinstance(items, str):
+        items = json.loads(items)
+    item_lines = '\n'.join(
+        f"{item.get('name')} x{item.get('quantity')} - ₹{round(item.get('mrp', item.get('price', 0)) * item.get('quantity', 1), 2)}"
+        for item in items
+    )
+    return TEMPLATES[template].format(
+        bill_number=txn['bill_number'],
+        total=txn['total_amount'],
+        payment_method=txn.get('payment_method') or '',
+        item_count=len(items),
+        date=str(txn.get('created_at') or txn.get('date') or '')[:10],
+        customer_name=txn.get('customer_name') or 'Guest',
+        items=item_lines,
+    )
+
+def clean_phone(phone: Optional[str]) -> Optional[str]:
+    """Return a 10-digit Indian mobile number, or None if invalid"""
+    digits = re.sub(r'\D', '', phone or '')
+    if len(digits) == 12 and digits.startswith('91'):
+        digits = digits[2:]
+    return digits if len(digits) == 10 else None
+
+# ============================================================================
+# PROVIDERS
+# ============================================================================
+
+class Provider:
+    """Sends a batch of (phone, message) pairs, returns per-message success"""
+
+    async def send_batch(self, messages: List[tuple]) -> List[bool]:
+        raise NotImplementedError
+
+class MockProvider(Provider):
+    """Local provider: simulated network latency and failure rate"""
+
+    def __init__(self, latency: float = 0.05, failure_rate: float = 0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.sent = 0
+
+    async def send_batch(self, messages: List[tuple]) -> List[bool]:
+        await asyncio.sleep(self.latency)
+        results = [random.random() >= self.failure_rate for _ in messages]
+        self.sent += sum(results)
+        return results
+
+class MSG91Provider(Provider):
+    """MSG91 flow API, which accepts many recipients per request"""
+
+    URL = 'https://api.msg91.com/api/v5/flow/'
+
+    def __init__(self, api_key: str, template_id: str):
+        self.api_key = api_key
+        self.template_id = template_id
+
+    def _post(self, messages: List[tuple]) -> bool:
+        body = json.dumps({
+            'template_id': self.template_id,
+            'short_url': '0',
+            'recipients': [{'mobiles': f"91{phone}", 'var': message} for phone, message in messages]
+        }).encode('utf-8')
+        request = urllib.request.Request(
+            self.URL, data=body, method='POST',
+            headers={'Content-Type': 'application/json', 'authkey': self.api_key}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=15) as response:
+                return json.load(response).get('type') == 'success'
+        except Exception as err:
+            print(f"❌ MSG91 batch failed: {err}")
+            return False
+
+    async def send_batch(self, messages: List[tuple]) -> List[bool]:
+        ok = await asyncio.to_thread(self._post, messages)
+        return [ok] * len(messages)
+
+PROVIDERS = {
+    'mock': lambda: MockProvider(),
+    'msg91': lambda: MSG91Provider(os.environ['MSG91_API_KEY'], os.environ.get('MSG91_TEMPLATE_ID', '')),
+}
+
+# ============================================================================
+# QUEUE STORES
+# ============================================================================
+
+class PostgresStore:
+    """Receipt queue backed by the transactions table"""
+
+    CLAIM_SQL = """
+        UPDATE public.transactions SET sms_claimed_at = now()
+        WHERE id IN (
+            SELECT id FROM public.transactions
+            WHERE sms_sent = false
+              AND payment_status = 'COMPLETED'
+              AND customer_phone IS NOT NULL
+              AND sms_attempts < %(max_attempts)s
+              AND created_at > now() - make_interval(hours => %(max_age)s)
+              AND (sms_claimed_at IS NULL
+                   OR sms_claimed_at < now() - make_interval(mins => %(claim_timeout)s))
+            ORDER BY created_at
+            LIMIT %(limit)s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, bill_number, customer_name, customer_phone, items,
+                  total_amount, payment_method, created_at
+    """
+
+    def __init__(self, dsn: str):
+        import psycopg
+        from psycopg.rows import dict_row
+        self.conn = psycopg.connect(dsn, autocommit=True, row_factory=dict_row)
+
+    async def claim(self, limit: int) -> List[Dict]:
+        return await asyncio.to_thread(self._execute, self.CLAIM_SQL, {
+            'limit': limit,
+            'max_attempts': MAX_ATTEMPTS,
+            'max_age': MAX_AGE_HOURS,
+            'claim_timeout': CLAIM_TIMEOUT_MINUTES,
+        }, True)
+
+    async def mark_sent(self, ids: List) -> None:
+        if ids:
+            await asyncio.to_thread(self._execute, """
+                UPDATE public.transactions
+                SET sms_sent = true, sms_sent_at = now(), sms_claimed_at = NULL
+                WHERE id = ANY(%(ids)s)
+            """, {'ids': ids})
+
+    async def mark_failed(self, ids: List) -> None:
+        # Restart the claim clock so a retry waits CLAIM_TIMEOUT_MINUTES
+        # instead of burning every attempt during a provider outage
+        if ids:
+            await asyncio.to_thread(self._execute, """
+                UPDATE public.transactions
+                SET sms_attempts = sms_attempts + 1, sms_claimed_at = now()
+                WHERE id = ANY(%(ids)s)
+            """, {'ids': ids})
+
+    def _execute(self, sql: str, params: Dict, fetch: bool = False):
+        with self.conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall() if fetch else None
+
+class MemoryStore:
+    """In-process queue with the same interface, for local runs and benchmarks"""
+
+    def __init__(self, transactions: List[Dict]):
+        self.pending = list(reversed(transactions))
+        self.sent: Dict = {}
+        self.attempts: Dict = {}
+        self.update_statements = 0
+
+    async def claim(self, limit: int) -> List[Dict]:
+        batch = self.pending[-limit:]
+        del self.pending[-limit:]
+        return list(reversed(batch))
+
+    async def mark_sent(self, ids: List) -> None:
+        if ids:
+            self.update_statements += 1
+            now = time.time()
+            for txn_id in ids:
+                self.sent[txn_id] = now
+
+    async def mark_failed(self, ids: List) -> None:
+        if ids:
+            self.update_statements += 1
+            for txn_id in ids:
+                self.attempts[txn_id] = self.attempts.get(txn_id, 0) + 1
+
+# ============================================================================
+# DISPATCHER
+# ============================================================================
+
+class RateLimiter:
+    """Token bucket shared by all in-flight batches"""
+
+    def __init__(self, rate: Optional[float]):
+        self.rate = rate
+        self.tokens = rate or 0.0
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, n: int) -> None:
+        if not self.rate:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(max(self.rate, n), self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                await asyncio.sleep((n - self.tokens) / self.rate)
+
+class Dispatcher:
+    """Pulls receipt jobs from a store and sends them through a provider"""
+
+    def __init__(self, store, provider: Provider, batch_size: int = BATCH_SIZE,
+                 max_in_flight: int = MAX_IN_FLIGHT, rate: Optional[float] = RATE_LIMIT,
+                 template: str = 'short'):
+        self.store = store
+        self.provider = provider
+        self.batch_size = batch_size
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.max_in_flight = max_in_flight
+        self.limiter = RateLimiter(rate)
+        self.template = template
+        self.stats = {'sent': 0, 'failed': 0, 'invalid': 0}
+
+    async def _send(self, jobs: List[Dict]) -> None:
+        try:
+            messages, ids, invalid = [], [], []
+            for txn in jobs:
+                phone = clean_phone(txn.get('customer_phone'))
+                if phone is None:
+                    invalid.append(txn['id'])
+                    continue
+                try:
+                    message = render_receipt(txn, self.template)
+                except Exception as err:
+                    print(f"❌ Could not render receipt for transaction {txn['id']}: {err!r}")
+                    invalid.append(txn['id'])
+                    continue
+                messages.append((phone, message))
+                ids.append(txn['id'])
+
+            sent, failed = [], []
+            if messages:
+                await self.limiter.acquire(len(messages))
+                try:
+                    results = await self.provider.send_batch(messages)
+                except Exception as err:
+                    print(f"❌ Provider failed for batch of {len(messages)}: {err!r}")
+                    results = [False] * len(messages)
+                for txn_id, ok in zip(ids, results):
+                    (sent if ok else failed).append(txn_id)
+
+            # Invalid numbers and unrenderable rows will never succeed; count them
+            # as failed attempts so they stop being reclaimed after MAX_ATTEMPTS
+            await self.store.mark_sent(sent)
+            await self.store.mark_failed(failed + invalid)
+            self.stats['sent'] += len(sent)
+            self.stats['failed'] += len(failed)
+            self.stats['invalid'] += len(invalid)
+        except Exception as err:
+            print(f"❌ Dispatch batch failed: {err!r}")
+            self.stats['failed'] += len(jobs)
+        finally:
+            self.slots.release()
+
+    async def run(self, once: bool = False) -> Dict:
+        """Dispatch until the queue is empty (once) or forever"""
+        tasks = set()
+        while True:
+            await self.slots.acquire()
+            jobs = await self.store.claim(self.batch_size)
+            if not jobs:
+                self.slots.release()
+                if once:
+                    break
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+            task = asyncio.create_task(self._send(jobs))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        return self.stats
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Send queued receipt SMS in batches")
+    parser.add_argument('--provider', choices=sorted(PROVIDERS), default='mock')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--max-in-flight', type=int, default=MAX_IN_FLIGHT)
+    parser.add_argument('--rate', type=float, default=RATE_LIMIT, help="messages per second, 0 = unlimited")
+    parser.add_argument('--template', choices=sorted(TEMPLATES), default='short')
+    parser.add_argument('--once', action='store_true', help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    dsn = os.environ.get('DB_CONNECTION_STRING')
+    if not dsn:
+        print("❌ DB_CONNECTION_STRING is missing")
+        raise SystemExit(1)
+
+    dispatcher = Dispatcher(
+        PostgresStore(dsn),
+        PROVIDERS[args.provider](),
+        batch_size=args.batch_size,
+        max_in_flight=args.max_in_flight,
+        rate=args.rate or None,
+        template=args.template,
+    )
+
+    print(f"📨 SMS dispatch worker started ({args.provider}, batch {args.batch_size}, "
+          f"{args.max_in_flight} in flight)")
+    stats = asyncio.run(dispatcher.run(once=args.once))
+    print(f"✅ Sent {stats['sent']:,}, failed {stats['failed']:,}, invalid {stats['invalid']:,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Tests for dedup_catalog.py
+Run: python -m pytest scripts/test_dedup_catalog.py (or python -m unittest)
+"""
+
+import csv
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from dedup_catalog import build_groups, cluster_names, normalize, write_outputs
+
+
+class ClusterNamesTest(unittest.TestCase):
+
+    def test_misspelling_merges_into_most_common_spelling(self):
+        canonical = cluster_names({'paracetamol 500mg': 5, 'paracetmol 500mg': 1})
+        self.assertEqual(canonical['paracetmol 500mg'], 'paracetamol 500mg')
+
+    def test_different_strengths_never_merge(self):
+        canonical = cluster_names({'paracetamol 500mg': 1, 'paracetamol 650mg': 1})
+        self.assertEqual(canonical['paracetamol 500mg'], 'paracetamol 500mg')
+        self.assertEqual(canonical['paracetamol 650mg'], 'paracetamol 650mg')
+
+    def test_variants_with_extra_or_different_words_never_merge(self):
+        pairs = [
+            ('Pan 40mg', 'Pan-D 40mg'),
+            ('Telmisartan 40mg', 'Telmisartan H 40mg'),
+            ('Amlodipine 5mg', 'Amlodipine AT 5mg'),
+            ('Glimepiride 2mg', 'Glimepiride M 2mg'),
+            ('Cetirizine 10mg', 'Levocetirizine 10mg'),
+            ('Metformin 500mg', 'Metformin SR 500mg'),
+            ('Metformin 500mg', 'Metformin ER 500mg'),
+            ('Metformin SR 500mg', 'Metformin ER 500mg'),
+            ('Betnovate Cream', 'Betnovate N Cream'),
+        ]
+        for a, b in pairs:
+            with self.subTest(a=a, b=b):
+                a, b = normalize(a), normalize(b)
+                canonical = cluster_names({a: 5, b: 1})
+                self.assertEqual(canonical[b], b)
+
+    def test_inventory_spellings_normalize_together(self):
+        self.assertEqual(normalize('DOLO-650 TAB'), normalize('Dolo 650 Tablets'))
+
+
+class BuildGroupsTest(unittest.TestCase):
+
+    def run_dedup(self, rows):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'products.ndjson'
+            path.write_text(''.join(json.dumps(r) + '\n' for r in rows), encoding='utf-8')
+            canonical_ids, count = build_groups(path)
+            stats = write_outputs(path, canonical_ids, Path(tmp) / 'out')
+            with open(Path(tmp) / 'out' / 'canonical_map.csv', encoding='utf-8') as f:
+                mapping = [(r['product_id'], r['canonical_id']) for r in csv.DictReader(f)]
+        return count, stats['canonical_products'], mapping
+
+    def test_duplicates_map_to_first_row(self):
+        rows = [
+            {'id': 'P1', 'name': 'Paracetamol 500mg', 'manufacturer': 'Cipla', 'pack_size': '10 tablets'},
+            {'id': 'P2', 'name': 'Paracetmol 500mg', 'manufacturer': 'Cipla', 'pack_size': '10 tablets'},
+            {'id': 'P3', 'name': 'Paracetamol 500mg', 'manufacturer': 'Cipla', 'pack_size': '10 tablets'},
+            {'id': 'P4', 'name': 'Paracetamol 650mg', 'manufacturer': 'Cipla', 'pack_size': '10 tablets'},
+        ]
+        count, canonical, mapping = self.run_dedup(rows)
+        self.assertEqual(count, 4)
+        self.assertEqual(canonical, 2)
+        self.assertEqual(mapping, [('P1', 'P1'), ('P2', 'P1'), ('P3', 'P1'), ('P4', 'P4')])
+
+    def test_rows_without_id_fall_back_to_barcode_or_row(self):
+        rows = [
+            {'barcode': '8901', 'name': 'Dolo 650mg', 'pack_size': '15 tablets'},
+            {'barcode': '8902', 'name': 'Dolo 650mg', 'pack_size': '15 tablets'},
+            {'name': 'Crocin 500mg', 'pack_size': '15 tablets'},
+        ]
+        _, canonical, mapping = self.run_dedup(rows)
+        self.assertEqual(canonical, 2)
+        self.assertEqual(mapping, [('8901', '8901'), ('8902', '8901'), ('row_2', 'row_2')])
+
+    def test_repeated_ids_yield_one_canonical_row(self):
+        rows = [{'id': 'X', 'name': 'Eno 5g sachet'}, {'id': 'X', 'name': 'Eno 5g sachet'}]
+        _, canonical, _ = self.run_dedup(rows)
+        self.assertEqual(canonical, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -187,8 +187,8 @@ export const PharmacyBilling = () => {
 
         storage.saveTransaction(txn);
 
-        // Send SMS
-        await SMSService.sendReceipt(customerPhone, {
+        // Send SMS (queued, does not hold up the till)
+        SMSService.queueReceipt(customerPhone, {
             billNumber: txn.bill_number,
             customerName: customerName,
             items: cart.map(i => ({ name: i.name, quantity: i.quantity, price: i.mrp })),
@@ -239,7 +239,7 @@ export const PharmacyBilling = () => {
 
         storage.saveTransaction(txn);
 
-        await SMSService.sendReceipt(customerPhone, {
+        SMSService.queueReceipt(customerPhone, {
             billNumber: txn.bill_number,
             customerName: customerName,
             items: cart.map(i => ({ name: i.name, quantity: i.quantity, price: i.mrp })),
@@ -20,7 +20,7 @@ export const StockEntry = () => {
                 return;
             }
             setLoading(true);
-            const results = await productSearch.search(searchTerm);
+            const results = await productSearch.search(searchTerm, { canonical: false });
             setProducts(results);
             setLoading(false);
         }, 500);
@@ -19,10 +19,15 @@ export const productSearch = {
         console.log('Supabase Search Initialized');
     },
 
-    search: async (query: string): Promise<Product[]> => {
-        try {
+    search: async (query: string, options: { canonical?: boolean } = {}): Promise<Product[]> => {
+        // Billing searches deduplicated products (supabase/product_dedup.sql),
+        // falling back to the raw inventory table if that view has not been
+        // created yet. Stock entry passes { canonical: false }: it updates a
+        // single inventory row, so it must see that row's own quantity.
+        const canonical = options.canonical ?? true;
+        const runQuery = (table: string) => {
             let dbQuery = supabase
-                .from('inventory')
+                .from(table)
                 .select(`
                     id,
                     med_name,
@@ -40,7 +45,15 @@ export const productSearch = {
                 dbQuery = dbQuery.ilike('med_name', `%${query}%`);
             }
 
-            const { data, error } = await dbQuery;
+            return dbQuery;
+        };
+
+        try {
+            let { data, error } = await runQuery(canonical ? 'inventory_canonical' : 'inventory');
+            if (error && canonical) {
+                console.warn('Canonical search unavailable, using inventory:', error.message);
+                ({ data, error } = await runQuery('inventory'));
+            }
 
             if (error) {
                 console.error('Supabase search error:', error);
@@ -140,6 +140,24 @@ Thank you for shopping!
 Call: 1800-XXX-XXXX`;
     }
 
+    // Queue receipt without blocking checkout.
+    // With VITE_SMS_DISPATCH_QUEUE=true the saved transaction row is the job:
+    // scripts/sms_dispatch.py sends it in a batch and marks sms_sent.
+    // Otherwise fall back to sending from the browser in the background; that
+    // path leaves sms_sent false, so never run the worker with the flag off.
+    static queueReceipt(phone: string, receiptData: ReceiptData): void {
+        if (import.meta.env.VITE_SMS_DISPATCH_QUEUE === 'true') {
+            console.log(`[SMS Service] Receipt ${receiptData.billNumber} queued for dispatch worker`);
+            return;
+        }
+
+        this.sendReceipt(phone, receiptData)
+            .then(result => {
+                if (!result.success) console.warn('[SMS Service] Receipt not sent:', result.error);
+            })
+            .catch(error => console.error('[SMS Service] Receipt send failed:', error));
+    }
+
     // Send receipt (automatically chooses provider)
     static async sendReceipt(
         phone: string,
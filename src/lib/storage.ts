@@ -11,6 +11,10 @@ const KEYS = {
     SETTINGS: 'pharmacy_settings'
 };
 
+// Local history is a recent-bills cache; full history lives in Supabase
+// (and in monthly archives once partitions are closed).
+const MAX_LOCAL_TRANSACTIONS = 500;
+
 export interface Transaction {
     id: string;
     bill_number: string;
@@ -32,7 +36,7 @@ export const storage = {
         // 1. Save to LocalStorage (Immediate UI update & Offline backup)
         const history = storage.getTransactions();
         history.unshift(transaction); // Add to top
-        localStorage.setItem(KEYS.TRANSACTIONS, JSON.stringify(history));
+        localStorage.setItem(KEYS.TRANSACTIONS, JSON.stringify(history.slice(0, MAX_LOCAL_TRANSACTIONS)));
 
         // Also update customer history if phone exists
         if (transaction.customer_phone) {
@@ -68,7 +72,8 @@ export const storage = {
     getTransactions: (): Transaction[] => {
         try {
             const data = localStorage.getItem(KEYS.TRANSACTIONS);
-            return data ? JSON.parse(data) : [];
+            const history: Transaction[] = data ? JSON.parse(data) : [];
+            return history.slice(0, MAX_LOCAL_TRANSACTIONS);
         } catch {
             return [];
         }
@@ -113,7 +118,7 @@ export const storage = {
                 const response = await fetch('/data/transactions.json');
                 const data = await response.json();
                 if (data.transactions) {
-                    localStorage.setItem(KEYS.TRANSACTIONS, JSON.stringify(data.transactions));
+                    localStorage.setItem(KEYS.TRANSACTIONS, JSON.stringify(data.transactions.slice(0, MAX_LOCAL_TRANSACTIONS)));
                     console.log('✅ Local storage initialized with sample transactions');
                 }
             } catch (err) {
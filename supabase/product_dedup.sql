@@ -0,0 +1,41 @@
+-- Canonical product mapping for duplicate inventory rows
+-- Run this in your Supabase SQL Editor, then import the canonical_map.csv
+-- produced by scripts/dedup_catalog.py (run on an inventory CSV export)
+-- into public.product_canonical_map.
+
+-- 1. Mapping table (inventory row -> canonical inventory row)
+create table if not exists public.product_canonical_map (
+  product_id bigint primary key,
+  canonical_id bigint not null
+);
+
+create index if not exists idx_product_canonical_map_canonical_id
+on public.product_canonical_map (canonical_id);
+
+-- 2. One row per canonical product and batch: spelling duplicates of the
+-- same batch/expiry are collapsed and their stock summed, but batches are
+-- never merged, so billing always sells against a real batch and expiry.
+-- The row keeps the canonical row's id when it holds that batch.
+-- productSearch.search (src/lib/product-search.ts) queries this view for
+-- billing; stock entry searches inventory directly.
+create or replace view public.inventory_canonical as
+select
+  (array_agg(i.id order by i.id <> c.id, i.id))[1] as id,
+  c.med_name,
+  (array_agg(i.cost_price order by i.id <> c.id, i.id))[1] as cost_price,
+  i.batch_id,
+  i.expiry_date,
+  (array_agg(i.status order by i.id <> c.id, i.id))[1] as status,
+  sum(i.quantity) as quantity
+from public.inventory i
+left join public.product_canonical_map m on m.product_id = i.id
+join public.inventory c on c.id = coalesce(m.canonical_id, i.id)
+group by c.id, c.med_name, i.batch_id, i.expiry_date;
+
+-- 3. Verify: duplicates collapsed per canonical product
+select canonical_id, count(*) as duplicates
+from public.product_canonical_map
+group by canonical_id
+having count(*) > 1
+order by duplicates desc
+limit 20;
@@ -0,0 +1,33 @@
+-- Receipt SMS dispatch queue
+-- Run this in your Supabase SQL Editor before starting scripts/sms_dispatch.py.
+-- Checkout only inserts the bill; the worker claims unsent rows, sends them in
+-- batches and marks them sent in bulk.
+-- Only run the worker with VITE_SMS_DISPATCH_QUEUE=true in the app: otherwise
+-- the browser already sends the receipt and the worker would send it again.
+
+-- 1. Queue columns on transactions
+-- Bills that exist when this migration first runs were already texted inline
+-- by the old checkout flow (schema.sql already has sms_sent, so that column
+-- can't tell a first run apart), so mark them sent only while sms_attempts,
+-- which this file introduces, does not exist yet. Re-running this file never
+-- touches pending receipts.
+do $$
+begin
+  if not exists (
+    select 1 from information_schema.columns
+    where table_schema = 'public' and table_name = 'transactions' and column_name = 'sms_attempts'
+  ) then
+    alter table public.transactions
+      add column if not exists sms_sent boolean default false not null,
+      add column if not exists sms_sent_at timestamp with time zone,
+      add column if not exists sms_claimed_at timestamp with time zone,
+      add column sms_attempts smallint default 0 not null;
+    update public.transactions set sms_sent = true, sms_sent_at = coalesce(sms_sent_at, created_at);
+  end if;
+end;
+$$;
+
+-- 2. Partial index so claiming only scans pending receipts
+create index if not exists idx_transactions_sms_pending
+on public.transactions (created_at)
+where sms_sent = false;
@@ -0,0 +1,160 @@
+-- Monthly range partitioning for public.transactions
+-- Run this in your Supabase SQL Editor after transactions.sql (and
+-- sms_dispatch.sql). Each month of bills lives in its own partition, so
+-- recent-bill lookups and inserts only touch the current months, and closed
+-- months can be archived by scripts/archive_transactions.py and dropped.
+
+begin;
+
+-- 1. Keep the old heap until the copy is verified
+alter table public.transactions rename to transactions_unpartitioned;
+alter table public.transactions_unpartitioned rename constraint transactions_pkey to transactions_unpartitioned_pkey;
+alter sequence if exists public.transactions_id_seq rename to transactions_unpartitioned_id_seq;
+alter index if exists public.idx_transactions_sms_pending rename to idx_transactions_unpartitioned_sms_pending;
+
+-- 2. Partitioned table (primary key must include the partition key)
+create table public.transactions (
+  id bigint generated by default as identity,
+  created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+  bill_number text not null,
+  customer_name text,
+  customer_phone text,
+  items jsonb not null, -- Stores the list of medicines bought
+  subtotal numeric,
+  discount numeric,
+  gst_amount numeric,
+  total_amount numeric not null,
+  payment_method text, -- 'CASH', 'UPI', 'RAZORPAY'
+  payment_status text default 'COMPLETED',
+  transaction_id text, -- UPI Ref or Razorpay ID
+  sms_sent boolean default false not null,
+  sms_sent_at timestamp with time zone,
+  sms_claimed_at timestamp with time zone,
+  sms_attempts smallint default 0 not null,
+  primary key (id, created_at)
+) partition by range (created_at);
+
+-- Catch-all so an insert never fails if a month was not created in time.
+-- create_transactions_partition moves such rows into their month, and
+-- ensure_transactions_partitions (scheduled below, and run by
+-- scripts/archive_transactions.py) drains every month out of it.
+create table public.transactions_default partition of public.transactions default;
+
+create index idx_transactions_created_at on public.transactions (created_at desc);
+create index idx_transactions_bill_number on public.transactions (bill_number);
+create index idx_transactions_customer_phone on public.transactions (customer_phone);
+create index idx_transactions_sms_pending on public.transactions (created_at) where sms_sent = false;
+
+-- 3. Partition management
+-- Creates the partition covering `month` (UTC), e.g. transactions_2025_12.
+-- Rows for that month already sitting in transactions_default are moved into
+-- it (Postgres refuses to create the month while the default holds them).
+create or replace function public.create_transactions_partition(month date)
+returns text
+language plpgsql
+as $$
+declare
+  start_at timestamptz := date_trunc('month', month)::timestamp at time zone 'utc';
+  end_at timestamptz := (date_trunc('month', month) + interval '1 month')::timestamp at time zone 'utc';
+  partition_name text := 'transactions_' || to_char(month, 'YYYY_MM');
+  create_sql text := format(
+    'create table public.%I partition of public.transactions for values from (%L) to (%L)',
+    partition_name, start_at, end_at
+  );
+begin
+  if to_regclass(format('public.%I', partition_name)) is not null then
+    return partition_name;
+  end if;
+
+  if not exists (
+    select 1 from public.transactions_default
+    where created_at >= start_at and created_at < end_at
+  ) then
+    execute create_sql;
+    return partition_name;
+  end if;
+
+  alter table public.transactions detach partition public.transactions_default;
+  execute create_sql;
+  execute format(
+    'insert into public.%I select * from public.transactions_default where created_at >= %L and created_at < %L',
+    partition_name, start_at, end_at
+  );
+  delete from public.transactions_default where created_at >= start_at and created_at < end_at;
+  alter table public.transactions attach partition public.transactions_default default;
+  return partition_name;
+end;
+$$;
+
+-- Moves every month out of transactions_default, then creates partitions
+-- from this month up to `months_ahead` months ahead. Must run at least
+-- monthly (pg_cron below, or the archiver), otherwise new bills pile up in
+-- the default partition until the next run.
+create or replace function public.ensure_transactions_partitions(months_ahead int default 2)
+returns void
+language plpgsql
+as $$
+declare
+  m date;
+  i int;
+begin
+  for m in
+    select distinct date_trunc('month', created_at at time zone 'utc')::date
+    from public.transactions_default
+  loop
+    perform public.create_transactions_partition(m);
+  end loop;
+
+  for i in 0..months_ahead loop
+    perform public.create_transactions_partition((date_trunc('month', now() at time zone 'utc') + make_interval(months => i))::date);
+  end loop;
+end;
+$$;
+
+-- 4. Backfill: one partition per month of existing history, then copy
+select public.create_transactions_partition(m::date)
+from generate_series(
+  date_trunc('month', coalesce((select min(created_at) from public.transactions_unpartitioned), now())),
+  date_trunc('month', now()),
+  interval '1 month'
+) as m;
+select public.ensure_transactions_partitions(2);
+
+insert into public.transactions overriding system value
+select id, created_at, bill_number, customer_name, customer_phone, items, subtotal, discount,
+       gst_amount, total_amount, payment_method, payment_status, transaction_id,
+       sms_sent, sms_sent_at, sms_claimed_at, sms_attempts
+from public.transactions_unpartitioned;
+
+select setval(
+  pg_get_serial_sequence('public.transactions', 'id'),
+  coalesce((select max(id) from public.transactions), 0) + 1,
+  false
+);
+
+-- 5. Same access rules as transactions.sql
+alter table public.transactions enable row level security;
+
+create policy "Allow public insert"
+on public.transactions
+for insert
+to anon
+with check (true);
+
+create policy "Allow public select"
+on public.transactions
+for select
+to anon
+using (true);
+
+commit;
+
+-- 6. Keep future months created and the default partition empty
+-- (requires the pg_cron extension; archive_transactions.py also runs it)
+-- select cron.schedule('transactions-partitions', '0 0 1 * *',
+--   $$select public.ensure_transactions_partitions(2)$$);
+
+-- 7. Verify, then drop the old heap
+-- select count(*) from public.transactions_unpartitioned;
+-- select count(*) from public.transactions;
+-- drop table public.transactions_unpartitioned;